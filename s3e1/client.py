@@ -1,7 +1,20 @@
 #!/usr/bin/env python3
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import platform
+import re
 import socket
 import struct
-from datetime import timedelta
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Generator, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 
 import click
 import numpy as np
@@ -15,45 +28,679 @@ import matplotlib.pyplot as plt
 #   Value t;
 #   std::size_t sample_rate;
 #   std::size_t num_threads;
+#   Mode mode;
 # };
-Params = struct.Struct("@ffffQQfQQ")
-
-Lx, Ly = 100, 100
-
-def call_tool(alpha: float, t: float, num_threads: int, port: int) -> tuple[timedelta, np.ndarray]:
-    params = Params.pack(
-        alpha, # 1.0
-        1e-3, 1e-1, 1e-1,
-        Lx, Ly,
-        t,  # 200.0
-        100,
-        num_threads,
-    )
+Params = struct.Struct("@ffffQQfQQQ")
+PARAMS_FIELDS = (
+    "alpha", "dt", "dx", "dy", "rows", "columns", "t", "sample_rate", "num_threads", "mode",
+)
+# enum class Mode : std::size_t
+MODE_RUN, MODE_STREAM, MODE_INFO = 0, 1, 2
+
+# std::chrono::system_clock::duration, nanoseconds
+WallTime = struct.Struct("@q")
+# Steps taken so far in front of every streamed frame, -1 after the last one.
+Step = struct.Struct("@q")
+# Length of the JSON answer to an info request.
+InfoSize = struct.Struct("@Q")
+
+DT, DX, DY = 1e-3, 1e-1, 1e-1
+# The server asserts rows, columns > 1 and its boundary writes the first
+# column of rows 0..29, anything smaller aborts or corrupts the server.
+MIN_ROWS, MIN_COLUMNS = 30, 2
+
+
+class ResultCache:
+    """Solver results on disk, keyed on a hash of the packed Params.
+
+    A run is deterministic given its Params, so the heatmap is stored as
+    `<key>.npy` (loaded memory-mapped) next to `<key>.json` with wall time
+    and the parameters. The least recently used entries are evicted once
+    they take more than `max_bytes`. The directory is created on first put.
+    """
+
+    ENTRY = re.compile(r"[0-9a-f]{64}\.(npy|json|\d+\.\d+\.tmp)")
+    # Halves of an entry older than this are left over from a crashed put,
+    # younger ones may still be being written.
+    ORPHAN_AGE = 60.0
+
+    def __init__(self, root: Path, max_bytes: int = 1 << 30) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(params: bytes) -> str:
+        return hashlib.sha256(params).hexdigest()
+
+    def get(self, params: bytes) -> tuple[timedelta, np.ndarray] | None:
+        path = self.root / f"{self.key(params)}.npy"
+        try:
+            meta = json.loads(path.with_suffix(".json").read_text())
+            dt = timedelta(microseconds=meta["wall_time_us"])
+            T = np.load(path, mmap_mode="r")
+            os.utime(path)  # mtime is the LRU clock
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupt entry, drop it and run the solver again.
+            self.remove(path)
+            return None
+        return dt, T
+
+    def put(self, params: bytes, dt: timedelta, T: np.ndarray) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / f"{self.key(params)}.npy"
+        meta = {
+            "wall_time_us": dt // timedelta(microseconds=1),
+            "params": dict(zip(PARAMS_FIELDS, Params.unpack(params))),
+        }
+        # Metadata goes first: an entry only counts once its .npy is in place.
+        # Both are renamed into place, so concurrent writers never see halves.
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, path.with_suffix(".json"))
+        with open(tmp, "wb") as f:
+            np.save(f, T)
+        os.replace(tmp, path)
+        self.evict()
+
+    @staticmethod
+    def remove(path: Path) -> None:
+        path.with_suffix(".npy").unlink(missing_ok=True)
+        path.with_suffix(".json").unlink(missing_ok=True)
+
+    def evict(self) -> None:
+        now = time.time()
+        files: dict[str, list[tuple[Path, os.stat_result]]] = {}
+        for path in self.root.iterdir():
+            if not self.ENTRY.fullmatch(path.name):
+                continue
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            files.setdefault(path.name[:64], []).append((path, st))
+
+        entries = []
+        for parts in files.values():
+            halves = {path.suffix: (path, st) for path, st in parts if path.suffix != ".tmp"}
+            complete = len(halves) == 2
+            for path, st in parts:
+                if (path.suffix == ".tmp" or not complete) and now - st.st_mtime > self.ORPHAN_AGE:
+                    path.unlink(missing_ok=True)
+            if complete:
+                (npy, npy_st), (_, json_st) = halves[".npy"], halves[".json"]
+                entries.append((npy_st.st_mtime, npy_st.st_size + json_st.st_size, npy))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self.remove(path)
+            total -= size
+
+
+class SolverUnavailable(ConnectionError):
+    """The solver server could not be connected to."""
+
+
+def connect(host: str, port: int) -> socket.socket:
+    try:
+        return socket.create_connection((host, port))
+    except OSError as e:
+        raise SolverUnavailable(f"cannot connect to {host}:{port}: {e}") from e
+
+
+def recv_exact(sock: socket.socket, buf: memoryview) -> None:
+    while buf:
+        n = sock.recv_into(buf)
+        if n == 0:
+            raise ConnectionError(f"truncated response: {len(buf)} bytes missing")
+        buf = buf[n:]
+
+
+def check_size(rows: int, columns: int) -> None:
+    if rows < MIN_ROWS or columns < MIN_COLUMNS:
+        raise ValueError(
+            f"grid must be at least {MIN_ROWS}x{MIN_COLUMNS}, got {rows}x{columns}"
+        )
+
+
+def pack_params(
+    alpha: float,
+    t: float,
+    num_threads: int,
+    rows: int,
+    columns: int,
+    sample_rate: int = 100,
+    mode: int = MODE_RUN,
+) -> bytes:
+    check_size(rows, columns)
+    return Params.pack(alpha, DT, DX, DY, rows, columns, t, sample_rate, num_threads, mode)
+
+
+def step_count(t: float) -> int:
+    # Same float32 arithmetic as Grid::run
+    return int(np.floor(np.float32(t) / np.float32(DT)))
+
+
+def frame_count(t: float, sample_rate: int) -> int:
+    return -(-step_count(t) // sample_rate)
+
+
+def recv_result(sock: socket.socket, rows: int, columns: int) -> tuple[timedelta, np.ndarray]:
+    # Result is the wall time followed by rows * columns float32 values,
+    # so everything is read straight into preallocated buffers.
+    header = bytearray(WallTime.size)
+    T = np.empty((rows, columns), dtype=np.float32)
+    recv_exact(sock, memoryview(header))
+    recv_exact(sock, memoryview(T).cast("B"))
+    if sock.recv(1):
+        raise ConnectionError(f"response is larger than {rows}x{columns} heatmap")
+
+    wall_time, = WallTime.unpack(header)
+    return timedelta(microseconds=wall_time / 1000), T
+
 
-    sock = socket.socket(family=socket.AF_INET, type=socket.SOCK_STREAM)
-    sock.connect(("127.0.0.1", port))
+async def connect_async(host: str, port: int, timeout: float = 10.0) -> socket.socket:
+    loop = asyncio.get_running_loop()
+    try:
+        (family, type_, proto, _, addr), *_ = await loop.getaddrinfo(
+            host, port, type=socket.SOCK_STREAM,
+        )
+        sock = socket.socket(family, type_, proto)
+        sock.setblocking(False)
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, addr), timeout)
+        except BaseException:
+            sock.close()
+            raise
+    except OSError as e:
+        raise SolverUnavailable(f"cannot connect to {host}:{port}: {e}") from e
+    return sock
 
-    sock.send(params)
 
-    heatmap = bytearray()
-    while True:
-        res = sock.recv(4096)
-        if not res:
-            break
-        heatmap.extend(res)
+async def recv_exact_async(sock: socket.socket, buf: memoryview) -> None:
+    loop = asyncio.get_running_loop()
+    while buf:
+        n = await loop.sock_recv_into(sock, buf)
+        if n == 0:
+            raise ConnectionError(f"truncated response: {len(buf)} bytes missing")
+        buf = buf[n:]
 
-    sock.close()
 
-    assert len(heatmap) >= 8
-    wall_time, = struct.unpack("@Q", heatmap[:8])
-    dt = timedelta(microseconds=wall_time / 1000)
+async def call_tool_async(
+    host: str, port: int, params: bytes, rows: int, columns: int,
+) -> tuple[timedelta, np.ndarray]:
+    """call_tool on a non-blocking socket, cancelling it closes the connection."""
+    loop = asyncio.get_running_loop()
+    header = bytearray(WallTime.size)
+    T = np.empty((rows, columns), dtype=np.float32)
+    with await connect_async(host, port) as sock:
+        await loop.sock_sendall(sock, params)
+        await recv_exact_async(sock, memoryview(header))
+        await recv_exact_async(sock, memoryview(T).cast("B"))
+        if await loop.sock_recv(sock, 1):
+            raise ConnectionError(f"response is larger than {rows}x{columns} heatmap")
 
-    T = np.frombuffer(heatmap[8:], dtype=np.float32).reshape((Lx, Ly))
+    wall_time, = WallTime.unpack(header)
+    return timedelta(microseconds=wall_time / 1000), T
+
+
+class ReferenceSolver:
+    """NumPy port of Grid::step with the geometry of server/main.cpp.
+
+    The stencil reads from a copy of u padded by one cell, whose wall cells
+    are filled with the values Grid::at reflects to along the wall normal.
+    Index arrays and buffers are built once, steps do not allocate.
+    """
+
+    def __init__(self, alpha: float, rows: int, columns: int) -> None:
+        check_size(rows, columns)
+        self.coef = np.float32(DT) * np.float32(alpha)
+        self.dx2 = np.float32(DX) * np.float32(DX)
+        self.dy2 = np.float32(DY) * np.float32(DY)
+
+        ys, xs = np.mgrid[-1:rows + 1, -1:columns + 1]
+        box = (ys >= 30) & (ys <= 60) & (xs <= 30)
+        wall = (xs == -1) | (xs == columns) | (ys == -1) | (ys == rows) | box
+        # First match wins, as in the wall normal lambda.
+        conds = [
+            xs == -1, xs == columns, ys == -1, ys == rows,
+            (xs == 30) & (ys >= 30) & (ys <= 60), (xs <= 30) & (ys == 30), (xs <= 30) & (ys == 60),
+        ]
+        nx = np.select(conds, [1, -1, 0, 0, 1, 0, 0], 0)
+        ny = np.select(conds, [0, 0, 1, -1, 0, -1, 1], 0)
+
+        self.padded = np.zeros((rows + 2, columns + 2), dtype=np.float32)
+        self.wall = np.flatnonzero(wall)
+        self.source = np.ravel_multi_index(
+            ((ys + 1 + ny)[wall], (xs + 1 + nx)[wall]), self.padded.shape,
+        )
+        self.reflected = np.empty(len(self.wall), dtype=np.float32)
+        self.fluid = ~wall[1:-1, 1:-1]
+
+        self.u = np.zeros((rows, columns), dtype=np.float32)
+        self.u_new = np.zeros_like(self.u)
+        self.d2x = np.empty_like(self.u)
+        self.d2y = np.empty_like(self.u)
+
+    def step(self) -> None:
+        u, p, d2x, d2y = self.u, self.padded, self.d2x, self.d2y
+        u[:30, 0] = 1.0
+
+        # Walls read the unreflected u, so gather everything before scattering.
+        c = p[1:-1, 1:-1]
+        np.copyto(c, u)
+        np.take(p, self.source, out=self.reflected)
+        np.put(p, self.wall, self.reflected)
+
+        # Same operation order as Grid::step, so only FMA contraction in the
+        # server build makes results differ.
+        np.multiply(c, 2, out=d2y)
+        np.subtract(p[1:-1, 2:], d2y, out=d2x)
+        np.add(d2x, p[1:-1, :-2], out=d2x)
+        np.divide(d2x, self.dx2, out=d2x)
+        np.subtract(p[2:, 1:-1], d2y, out=d2y)
+        np.add(d2y, p[:-2, 1:-1], out=d2y)
+        np.divide(d2y, self.dy2, out=d2y)
+
+        np.add(d2x, d2y, out=d2x)
+        np.multiply(d2x, self.coef, out=d2x)
+        np.add(d2x, c, out=d2x)
+        np.copyto(self.u_new, d2x, where=self.fluid)
+
+        self.u, self.u_new = self.u_new, self.u
+
+    def run(self, t: float, stop: threading.Event | None = None) -> tuple[timedelta, np.ndarray]:
+        start = time.perf_counter()
+        for _ in range(step_count(t)):
+            if stop is not None and stop.is_set():
+                raise InterruptedError("reference run stopped")
+            self.step()
+        dt = timedelta(seconds=time.perf_counter() - start)
+        return dt, self.u
+
+
+def call_tool(
+    alpha: float,
+    t: float,
+    num_threads: int,
+    port: int,
+    rows: int = 100,
+    columns: int = 100,
+    host: str = "127.0.0.1",
+    cache: ResultCache | None = None,
+    local: bool = False,
+) -> tuple[timedelta, np.ndarray]:
+    # Local runs are cheap and not bit-identical to the server, keep them out of the cache.
+    if local:
+        return ReferenceSolver(alpha, rows, columns).run(t)
+
+    params = pack_params(alpha, t, num_threads, rows, columns)
+    if cache is not None and (hit := cache.get(params)) is not None:
+        return hit
+
+    with connect(host, port) as sock:
+        sock.sendall(params)
+        dt, T = recv_result(sock, rows, columns)
+
+    if cache is not None:
+        cache.put(params, dt, T)
     return dt, T
 
+
+def truncate_series(path: Path, frames: int) -> None:
+    """Shrink a `.npy` time series in place to its first `frames` frames."""
+    with open(path, "r+b") as f:
+        version = np.lib.format.read_magic(f)
+        read_header = (
+            np.lib.format.read_array_header_1_0 if version == (1, 0)
+            else np.lib.format.read_array_header_2_0
+        )
+        shape, fortran_order, dtype = read_header(f)
+        offset = f.tell()
+
+        # The new shape is never longer, so the header keeps its size.
+        header = repr({
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": fortran_order,
+            "shape": (frames, *shape[1:]),
+        })
+        start = len(np.lib.format.magic(*version)) + (2 if version == (1, 0) else 4)
+        f.seek(start)
+        f.write(header.encode("latin1").ljust(offset - start - 1) + b"\n")
+        f.truncate(offset + frames * int(np.prod(shape[1:])) * dtype.itemsize)
+
+
+def stream_tool(
+    alpha: float,
+    t: float,
+    num_threads: int,
+    port: int,
+    path: Path,
+    rows: int = 100,
+    columns: int = 100,
+    sample_rate: int = 100,
+    host: str = "127.0.0.1",
+) -> Generator[np.ndarray, None, tuple[timedelta, np.ndarray]]:
+    """Yield sampled frames while the solver runs, the final result is returned.
+
+    Frames are received directly into a memory-mapped `.npy` time series at
+    `path`, so yielded arrays are views into it and stay valid after the run.
+    If the run is cut short, the file is truncated to the frames received.
+    """
+    if sample_rate < 1:
+        raise ValueError("sample_rate must be positive")
+    params = pack_params(alpha, t, num_threads, rows, columns, sample_rate, MODE_STREAM)
+
+    n = frame_count(t, sample_rate)
+    frames = np.lib.format.open_memmap(
+        path, mode="w+", dtype=np.float32, shape=(n, rows, columns),
+    )
+    step = bytearray(Step.size)
+    received = 0
+
+    try:
+        with connect(host, port) as sock:
+            sock.sendall(params)
+            for i in range(n + 1):
+                recv_exact(sock, memoryview(step))
+                tag, = Step.unpack(step)
+                # Frame i is sampled after 0-based step i * sample_rate.
+                expected = i * sample_rate + 1 if i < n else -1
+                if tag != expected:
+                    raise ConnectionError(f"unexpected frame {tag}, expected {expected}")
+                if i < n:
+                    recv_exact(sock, memoryview(frames[i]).cast("B"))
+                    received += 1
+                    yield frames[i]
+
+            result = recv_result(sock, rows, columns)
+    except BaseException:
+        # Also on close(): zero-filled trailing frames must not look like data.
+        frames.flush()
+        truncate_series(path, received)
+        raise
+
+    frames.flush()
+    return result
+
+
+Endpoint = tuple[str, int]
+# Pseudo endpoint for in-process ReferenceSolver runs.
+LOCAL: Endpoint = ("local", 0)
+
+
+class SweepError(Exception):
+    """Some sweep jobs could not be run."""
+
+    def __init__(self, failed: list[tuple["Job", Exception]]) -> None:
+        job, e = failed[0]
+        super().__init__(f"{len(failed)} job(s) failed, first: {job}: {e!r}")
+        self.failed = failed
+
+
+@dataclass(frozen=True)
+class Job:
+    alpha: float
+    t: float
+    rows: int
+    columns: int
+    num_threads: int
+
+
+@dataclass(frozen=True)
+class JobResult:
+    job: Job
+    endpoint: Endpoint
+    wall_time: timedelta
+    heatmap: np.ndarray
+    # Wall time is then that of the run which filled the cache.
+    cached: bool = False
+
+
+async def sweep(
+    jobs: Iterable[Job],
+    endpoints: Iterable[Endpoint],
+    retries: int = 3,
+    backoff: float = 0.5,
+    cache: ResultCache | None = None,
+    timeout: float | None = None,
+) -> AsyncIterator[JobResult]:
+    """Run jobs on a pool of solver servers, one in-flight job per server.
+
+    Results are yielded in completion order. A server that cannot be reached
+    hands its job back to the queue and backs off exponentially; it is retired
+    after more than `retries` failures in a row. A job that loses its
+    connection mid-run or takes longer than `timeout` seconds is retried,
+    preferably elsewhere, up to `retries` times; any other error fails it at
+    once. Failed jobs are reported once the sweep is over.
+
+    Server jobs run on non-blocking sockets, so leaving the sweep closes
+    their connections right away.
+    """
+    jobs = list(jobs)
+    endpoints = list(endpoints)
+    if not endpoints:
+        raise ValueError("no solver endpoints given")
+
+    pending: asyncio.Queue[tuple[Job, int]] = asyncio.Queue()
+    done: asyncio.Queue[JobResult | tuple[Job, Exception]] = asyncio.Queue()
+    for job in jobs:
+        pending.put_nowait((job, 0))
+
+    loop = asyncio.get_running_loop()
+    # ReferenceSolver is CPU bound, it gets threads of its own.
+    executor = ThreadPoolExecutor(max_workers=max(1, endpoints.count(LOCAL)))
+    alive = len(endpoints)
+
+    async def run_local(job: Job) -> tuple[timedelta, np.ndarray]:
+        stop = threading.Event()
+        solver = ReferenceSolver(job.alpha, job.rows, job.columns)
+        try:
+            return await loop.run_in_executor(executor, solver.run, job.t, stop)
+        finally:
+            stop.set()
+
+    async def run(endpoint: Endpoint, job: Job) -> JobResult:
+        if endpoint == LOCAL:
+            dt, T = await asyncio.wait_for(run_local(job), timeout)
+            return JobResult(job, endpoint, dt, T)
+
+        params = pack_params(job.alpha, job.t, job.num_threads, job.rows, job.columns)
+        if cache is not None and (hit := cache.get(params)) is not None:
+            return JobResult(job, endpoint, *hit, cached=True)
+
+        host, port = endpoint
+        dt, T = await asyncio.wait_for(
+            call_tool_async(host, port, params, job.rows, job.columns), timeout,
+        )
+        if cache is not None:
+            await asyncio.to_thread(cache.put, params, dt, T)
+        return JobResult(job, endpoint, dt, T)
+
+    async def worker(endpoint: Endpoint) -> None:
+        nonlocal alive
+        down = 0  # failures in a row
+        while True:
+            job, failures = await pending.get()
+            try:
+                result = await run(endpoint, job)
+            except OSError as e:
+                # TimeoutError included, the server may be alive but stuck.
+                if isinstance(e, SolverUnavailable):
+                    # Not the job's fault, it goes back as is.
+                    pending.put_nowait((job, failures))
+                elif failures >= retries:
+                    done.put_nowait((job, e))
+                else:
+                    pending.put_nowait((job, failures + 1))
+
+                down += 1
+                if down > retries:
+                    alive -= 1
+                    if not alive:
+                        # Nobody is left to run what is queued.
+                        while not pending.empty():
+                            done.put_nowait((pending.get_nowait()[0], e))
+                    return
+                # Back off this server only, others keep draining the queue.
+                await asyncio.sleep(backoff * 2**(down - 1))
+            except Exception as e:
+                done.put_nowait((job, e))
+            else:
+                down = 0
+                done.put_nowait(result)
+
+    workers = [asyncio.create_task(worker(e)) for e in endpoints]
+    failed: list[tuple[Job, Exception]] = []
+    try:
+        for _ in range(len(jobs)):
+            result = await done.get()
+            if isinstance(result, JobResult):
+                yield result
+            else:
+                failed.append(result)
+    finally:
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if failed:
+        raise SweepError(failed) from failed[0][1]
+
+
+def parse_endpoint(value: str) -> Endpoint:
+    if value == "local":
+        return LOCAL
+    host, _, port = value.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def parse_size(value: str) -> tuple[int, int]:
+    rows, _, columns = value.partition("x")
+    rows, columns = int(rows), int(columns or rows)
+    check_size(rows, columns)
+    return rows, columns
+
+
+def host_info() -> dict:
+    return {
+        "node": platform.node(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+    }
+
+
+def solver_info(endpoint: Endpoint) -> dict:
+    """Host and build details of the machine the solver runs on."""
+    host, port = endpoint
+    with connect(host, port) as sock:
+        sock.sendall(pack_params(0.0, 0.0, 0, MIN_ROWS, MIN_COLUMNS, mode=MODE_INFO))
+        header = bytearray(InfoSize.size)
+        recv_exact(sock, memoryview(header))
+        size, = InfoSize.unpack(header)
+        info = bytearray(size)
+        recv_exact(sock, memoryview(info))
+    return json.loads(info)
+
+
+def measure(run: Callable[[], timedelta], warmup: int, repeat: int) -> list[float]:
+    for _ in range(warmup):
+        run()
+    return [run().total_seconds() for _ in range(repeat)]
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    q25, median, q75 = np.percentile(samples, [25, 50, 75])
+    return {
+        "median": float(median),
+        "q25": float(q25),
+        "q75": float(q75),
+        "iqr": float(q75 - q25),
+        "min": min(samples),
+        "max": max(samples),
+    }
+
+
+def benchmark(
+    endpoint: Endpoint,
+    sizes: Iterable[tuple[int, int]],
+    threads: Iterable[int],
+    modes: Iterable[str] = ("strong", "weak"),
+    alpha: float = 1.0,
+    t: float = 5.0,
+    warmup: int = 1,
+    repeat: int = 5,
+) -> dict:
+    """Time the solver over grid sizes and thread counts.
+
+    Strong scaling keeps the grid fixed; weak scaling widens it to
+    `columns * threads`, so every thread keeps the same amount of cells.
+    Times are the solver reported wall times, the cache is never used.
+    Speedup and efficiency are relative to the smallest thread count.
+    """
+    if endpoint == LOCAL:
+        # ReferenceSolver ignores num_threads, its "scaling" would be noise.
+        raise ValueError("the local solver is single threaded and cannot be benchmarked")
+    threads = sorted(threads)
+    if threads and threads[0] < 1:
+        raise ValueError("thread counts must be positive")
+    host, port = endpoint
+    # Timings belong to the solver host, which need not be this one.
+    solver = solver_info(endpoint)
+    cases = []
+    for mode, (rows, columns) in itertools.product(modes, sizes):
+        base = None
+        for n in threads:
+            width = columns * n if mode == "weak" else columns
+
+            def run() -> timedelta:
+                return call_tool(alpha, t, n, port, rows, width, host, local=endpoint == LOCAL)[0]
+
+            samples = measure(run, warmup, repeat)
+            stats = summarize(samples)
+            base = base or (n, stats["median"])
+            ratio = base[1] / stats["median"]
+            # Weak scaling: ideal time is constant, so the ratio is already efficiency.
+            speedup = ratio * n / base[0] if mode == "weak" else ratio
+            cases.append({
+                "mode": mode,
+                "rows": rows,
+                "columns": width,
+                "threads": n,
+                "samples": samples,
+                **stats,
+                "speedup": speedup,
+                "efficiency": speedup * base[0] / n,
+            })
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "client": host_info(),
+        "server": f"{host}:{port}",
+        "solver": solver,
+        "params": {"alpha": alpha, "t": t, "dt": DT, "dx": DX, "dy": DY},
+        "warmup": warmup,
+        "repeat": repeat,
+        "cases": cases,
+    }
+
+
 @click.group()
-def client() -> None:
-    pass
+@click.option("--cache-dir", type=click.Path(file_okay=False, path_type=Path),
+              default=Path.home() / ".cache" / "s3e1", show_default=True)
+@click.option("--cache-size", type=int, default=1024, show_default=True,
+              help="Cache size cap, MiB.")
+@click.option("--no-cache", is_flag=True, help="Always run the solver.")
+@click.pass_context
+def client(ctx: click.Context, cache_dir: Path, cache_size: int, no_cache: bool) -> None:
+    ctx.obj = None if no_cache else ResultCache(cache_dir, cache_size << 20)
 
 
 @client.command("compare")
@@ -69,16 +716,212 @@ def compare() -> None:
     click.echo("file saved: plog.png")
 
 
-# TODO: area size
+@client.command("bench")
+@click.option("--size", "sizes", multiple=True, default=["100x100", "200x200"],
+              show_default=True, help="Grid size as ROWSxCOLUMNS, the base size for weak scaling.")
+@click.option("--threads", type=click.IntRange(min=1), multiple=True, default=[1, 2, 4, 8],
+              show_default=True)
+@click.option("--mode", "modes", type=click.Choice(["strong", "weak"]), multiple=True,
+              default=["strong", "weak"], show_default=True)
+@click.option("--alpha", type=float, default=1.0, show_default=True)
+@click.option("-t", type=float, default=5.0, show_default=True)
+@click.option("--warmup", type=click.IntRange(min=0), default=1, show_default=True)
+@click.option("--repeat", type=click.IntRange(min=1), default=5, show_default=True)
+@click.option("--server", default="127.0.0.1:1449", show_default=True,
+              help="Solver endpoint as HOST:PORT, the local solver cannot be benchmarked.")
+@click.option("--output", type=click.Path(dir_okay=False, path_type=Path))
+def bench(
+    sizes: tuple[str, ...],
+    threads: tuple[int, ...],
+    modes: tuple[str, ...],
+    alpha: float,
+    t: float,
+    warmup: int,
+    repeat: int,
+    server: str,
+    output: Path | None,
+) -> None:
+    """Measure strong and weak scaling of the solver.
+
+    Defaults finish in minutes. Cost grows linearly with -t, with the
+    number of cells and with --repeat, and weak mode widens every size by
+    up to the largest thread count. For sizing runs, raise -t and add
+    larger --size values and thread counts step by step, e.g.
+    `-t 50 --size 400x400 --size 1000x1000 --threads 16`.
+    """
+    try:
+        grid_sizes = [parse_size(s) for s in sizes]
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--size")
+    endpoint = parse_endpoint(server)
+    if endpoint == LOCAL:
+        raise click.BadParameter(
+            "the local solver is single threaded and cannot be benchmarked", param_hint="--server",
+        )
+
+    results = benchmark(
+        endpoint, grid_sizes, threads, modes,
+        alpha, t, warmup, repeat,
+    )
+    solver = results["solver"]
+    click.echo(f"solver: {solver['node']}, {solver['cpu_count']} CPUs")
+    for c in results["cases"]:
+        click.echo(
+            f"{c['mode']:>6} {c['rows']}x{c['columns']} threads={c['threads']}: "
+            f"median={c['median']:.4f}s iqr={c['iqr']:.4f}s "
+            f"speedup={c['speedup']:.2f} efficiency={c['efficiency']:.2f}"
+        )
+
+    output = output or Path(f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    output.write_text(json.dumps(results, indent=2))
+    click.echo(f"file saved: {output}")
+
+
+@client.command("bench-plot")
+@click.argument("files", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path))
+@click.option("--output", type=click.Path(dir_okay=False, path_type=Path),
+              default="bench.png", show_default=True)
+def bench_plot(files: tuple[Path, ...], output: Path) -> None:
+    fig, (ax_time, ax_speedup, ax_eff) = plt.subplots(1, 3, figsize=(15, 4.5))
+    for path in files:
+        results = json.loads(path.read_text())
+        groups: dict[tuple, list[dict]] = {}
+        for c in results["cases"]:
+            # Weak scaling cases of one series differ in width, key on the base one.
+            base_columns = c["columns"] // c["threads"] if c["mode"] == "weak" else c["columns"]
+            groups.setdefault((c["mode"], c["rows"], base_columns), []).append(c)
+
+        for (mode, rows, columns), cases in groups.items():
+            label = f"{results['solver']['node']} {mode} {rows}x{columns}"
+            if len(files) > 1:
+                label = f"{path.stem}: {label}"
+            n = [c["threads"] for c in cases]
+            median = np.array([c["median"] for c in cases])
+            yerr = (median - [c["q25"] for c in cases], [c["q75"] for c in cases] - median)
+            ax_time.errorbar(n, median, yerr=yerr, marker="o", capsize=3, label=label)
+            ax_speedup.plot(n, [c["speedup"] for c in cases], marker="o", label=label)
+            ax_eff.plot(n, [c["efficiency"] for c in cases], marker="o", label=label)
+
+    n = sorted({c["threads"] for path in files for c in json.loads(path.read_text())["cases"]})
+    ax_speedup.plot(n, [i / n[0] for i in n], "k--", label="ideal")
+    ax_eff.axhline(1.0, color="k", linestyle="--", label="ideal")
+
+    ax_time.set_title("Median time, quartile bars")
+    ax_time.set_ylabel("Time, s")
+    ax_speedup.set_title("Speedup")
+    ax_eff.set_title("Parallel efficiency")
+    for ax in (ax_time, ax_speedup, ax_eff):
+        ax.set_xlabel("threads, #")
+        ax.grid(True, alpha=0.3)
+    ax_eff.legend(fontsize="small")
+    fig.tight_layout()
+    fig.savefig(output)
+
+    click.echo(f"file saved: {output}")
+
+
 @client.command("compute")
 @click.argument("alpha", type=float)
 @click.argument("t", type=float)
-def compute(alpha: float, t: float) -> None:
-    _, T = call_tool(alpha, t, 12, 1449)
+@click.option("--rows", type=click.IntRange(min=MIN_ROWS), default=100, show_default=True)
+@click.option("--columns", type=click.IntRange(min=MIN_COLUMNS), default=100, show_default=True)
+@click.option("--local", is_flag=True, help="Use the in-process NumPy solver.")
+@click.pass_obj
+def compute(
+    cache: ResultCache | None, alpha: float, t: float, rows: int, columns: int, local: bool,
+) -> None:
+    _, T = call_tool(alpha, t, 12, 1449, rows, columns, cache=cache, local=local)
     # TODO Info
     plt.imsave("heatmap.png", T)
 
     click.echo("file saved: heatmap.png")
 
+
+@client.command("verify")
+@click.argument("alpha", type=float)
+@click.argument("t", type=float)
+@click.option("--rows", type=click.IntRange(min=MIN_ROWS), default=100, show_default=True)
+@click.option("--columns", type=click.IntRange(min=MIN_COLUMNS), default=100, show_default=True)
+@click.option("--rtol", type=float, default=1e-5, show_default=True)
+@click.option("--atol", type=float, default=1e-5, show_default=True)
+def verify(alpha: float, t: float, rows: int, columns: int, rtol: float, atol: float) -> None:
+    _, expected = call_tool(alpha, t, 12, 1449, rows, columns, local=True)
+    _, T = call_tool(alpha, t, 12, 1449, rows, columns)
+    diff = np.abs(T - expected).max()
+    if not np.allclose(T, expected, rtol=rtol, atol=atol):
+        raise click.ClickException(f"server result differs from reference: max |diff| = {diff:g}")
+
+    click.echo(f"ok: max |diff| = {diff:g}")
+
+
+@client.command("stream")
+@click.argument("alpha", type=float)
+@click.argument("t", type=float)
+@click.option("--rows", type=click.IntRange(min=MIN_ROWS), default=100, show_default=True)
+@click.option("--columns", type=click.IntRange(min=MIN_COLUMNS), default=100, show_default=True)
+@click.option("--sample-rate", type=click.IntRange(min=1), default=100, show_default=True)
+@click.option("--output", type=click.Path(dir_okay=False, path_type=Path),
+              default="series.npy", show_default=True)
+def stream(alpha: float, t: float, rows: int, columns: int, sample_rate: int, output: Path) -> None:
+    frames = stream_tool(alpha, t, 12, 1449, output, rows, columns, sample_rate)
+    with click.progressbar(frames, length=frame_count(t, sample_rate), label="frames") as bar:
+        for _ in bar:
+            pass
+
+    click.echo(f"file saved: {output}")
+
+
+@client.command("sweep")
+@click.option("--alpha", "alphas", type=float, multiple=True, default=[1.0], show_default=True)
+@click.option("-t", "ts", type=float, multiple=True, default=[200.0], show_default=True)
+@click.option("--size", "sizes", multiple=True, default=["100x100"], show_default=True,
+              help="Grid size as ROWSxCOLUMNS.")
+@click.option("--threads", type=click.IntRange(min=1), multiple=True, default=[12], show_default=True)
+@click.option("--server", "servers", multiple=True, default=["127.0.0.1:1449"], show_default=True,
+              help="Solver endpoint as HOST:PORT or 'local', repeat for every instance.")
+@click.option("--retries", type=click.IntRange(min=0), default=3, show_default=True)
+@click.option("--timeout", type=click.FloatRange(min=0, min_open=True),
+              help="Seconds a job may take before it is retried, no limit by default.")
+@click.option("--output", type=click.Path(file_okay=False, path_type=Path), default="sweep",
+              show_default=True)
+@click.pass_obj
+def sweep_command(
+    cache: ResultCache | None,
+    alphas: tuple[float, ...],
+    ts: tuple[float, ...],
+    sizes: tuple[str, ...],
+    threads: tuple[int, ...],
+    servers: tuple[str, ...],
+    retries: int,
+    timeout: float | None,
+    output: Path,
+) -> None:
+    try:
+        grid_sizes = [parse_size(s) for s in sizes]
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--size")
+    jobs = [
+        Job(alpha, t, *size, n)
+        for alpha, t, size, n in itertools.product(alphas, ts, grid_sizes, threads)
+    ]
+    endpoints = [parse_endpoint(s) for s in servers]
+    output.mkdir(parents=True, exist_ok=True)
+
+    async def run() -> None:
+        async for r in sweep(jobs, endpoints, retries, cache=cache, timeout=timeout):
+            j = r.job
+            name = f"alpha={j.alpha}_t={j.t}_{j.rows}x{j.columns}_threads={j.num_threads}.npy"
+            np.save(output / name, r.heatmap)
+            host, port = r.endpoint
+            cached = " (cached)" if r.cached else ""
+            click.echo(f"{host}:{port}: {name}: {r.wall_time.total_seconds():.3f}s{cached}")
+
+    try:
+        asyncio.run(run())
+    except SweepError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"{len(jobs)} results saved: {output}")
+
+
 if __name__ == "__main__":
     client()
\ No newline at end of file
@@ -0,0 +1,367 @@
+import asyncio
+import os
+import socket
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from client import (
+    LOCAL,
+    Job,
+    DT,
+    DX,
+    DY,
+    Params,
+    ReferenceSolver,
+    ResultCache,
+    Step,
+    SolverUnavailable,
+    SweepError,
+    WallTime,
+    call_tool,
+    frame_count,
+    pack_params,
+    stream_tool,
+    sweep,
+    truncate_series,
+)
+
+
+def read_params(conn: socket.socket) -> tuple:
+    buf = b""
+    while len(buf) < Params.size:
+        buf += conn.recv(Params.size - len(buf))
+    return Params.unpack(buf)
+
+
+def healthy(conn: socket.socket) -> None:
+    # Heatmap filled with alpha, so results can be told apart.
+    alpha, *_, rows, columns, _, _, _, _ = read_params(conn)
+    conn.sendall(WallTime.pack(10**6) + np.full(rows * columns, alpha, np.float32).tobytes())
+
+
+def truncating(conn: socket.socket) -> None:
+    *_, rows, columns, _, _, _, _ = read_params(conn)
+    conn.sendall(WallTime.pack(10**6) + bytes(rows * columns * 2))
+
+
+def silent(conn: socket.socket) -> None:
+    read_params(conn)
+    time.sleep(5)
+
+
+@pytest.fixture()
+def solver_server():
+    """Start fake solver servers, every connection goes to `handler`."""
+    socks = []
+
+    def start(handler) -> tuple[tuple[str, int], list[int]]:
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(8)
+        socks.append(sock)
+        calls = []
+
+        def serve() -> None:
+            while True:
+                try:
+                    conn, _ = sock.accept()
+                except OSError:
+                    return
+                calls.append(1)
+                with conn:
+                    handler(conn)
+
+        threading.Thread(target=serve, daemon=True).start()
+        return sock.getsockname(), calls
+
+    yield start
+    for sock in socks:
+        sock.close()
+
+
+@pytest.fixture()
+def dead_endpoint() -> tuple[str, int]:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    endpoint = sock.getsockname()
+    sock.close()
+    return endpoint
+
+
+async def collect(*args, **kwargs) -> list:
+    return [r async for r in sweep(*args, **kwargs)]
+
+
+def run_sweep(*args, **kwargs) -> list:
+    return asyncio.run(asyncio.wait_for(collect(*args, **kwargs), 10))
+
+
+JOBS = [Job(float(alpha), 1.0, 30, 20, 1) for alpha in range(6)]
+
+
+def test_call_tool_detects_truncated_response(solver_server):
+    (host, port), _ = solver_server(truncating)
+    with pytest.raises(ConnectionError, match="truncated"):
+        call_tool(1.0, 1.0, 1, port, 30, 20, host)
+
+
+def test_call_tool_unreachable(dead_endpoint):
+    host, port = dead_endpoint
+    with pytest.raises(SolverUnavailable):
+        call_tool(1.0, 1.0, 1, port, 30, 20, host)
+
+
+def test_sweep_runs_everything_on_healthy_server(solver_server, dead_endpoint):
+    endpoint, _ = solver_server(healthy)
+    results = run_sweep(JOBS, [dead_endpoint, endpoint], retries=1, backoff=0.01)
+
+    assert sorted(r.job.alpha for r in results) == [j.alpha for j in JOBS]
+    assert {r.endpoint for r in results} == {endpoint}
+    for r in results:
+        assert r.heatmap.shape == (30, 20)
+        assert (r.heatmap == r.job.alpha).all()
+
+
+def test_sweep_reports_every_job_when_all_servers_are_dead(dead_endpoint):
+    with pytest.raises(SweepError) as e:
+        run_sweep(JOBS, [dead_endpoint, dead_endpoint], retries=1, backoff=0.01)
+
+    assert sorted(job.alpha for job, _ in e.value.failed) == [j.alpha for j in JOBS]
+    assert all(isinstance(exc, SolverUnavailable) for _, exc in e.value.failed)
+
+
+def test_sweep_retries_job_lost_mid_run(solver_server):
+    endpoint, calls = solver_server(truncating)
+    with pytest.raises(SweepError) as e:
+        run_sweep(JOBS[:1], [endpoint], retries=1, backoff=0.01)
+
+    [(_, exc)] = e.value.failed
+    assert isinstance(exc, ConnectionError)
+    assert len(calls) == 2
+
+
+def test_sweep_times_out_silent_server(solver_server):
+    stuck, _ = solver_server(silent)
+    endpoint, _ = solver_server(healthy)
+    results = run_sweep(JOBS, [stuck, endpoint], retries=1, backoff=0.01, timeout=0.3)
+
+    assert len(results) == len(JOBS)
+    assert {r.endpoint for r in results} == {endpoint}
+
+
+def test_sweep_job_error_does_not_hang():
+    jobs = [Job(1.0, 0.01, 10, 10, 1), Job(1.0, 0.01, 30, 10, 1)]
+    with pytest.raises(SweepError) as e:
+        run_sweep(jobs, [LOCAL])
+
+    [(job, exc)] = e.value.failed
+    assert job == jobs[0]
+    assert isinstance(exc, ValueError)
+
+
+def put(cache: ResultCache, alpha: float, mtime: float | None = None) -> bytes:
+    params = pack_params(alpha, 1.0, 1, 30, 20)
+    cache.put(params, timedelta(seconds=alpha), np.full((30, 20), alpha, np.float32))
+    if mtime is not None:
+        os.utime(cache.root / f"{cache.key(params)}.npy", (mtime, mtime))
+    return params
+
+
+def test_cache_roundtrip(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    params = pack_params(1.0, 1.0, 1, 30, 20)
+    assert cache.get(params) is None
+    assert not cache.root.exists()
+
+    put(cache, 1.0)
+    dt, T = cache.get(params)
+    assert dt == timedelta(seconds=1.0)
+    assert isinstance(T, np.memmap)
+    assert (T == 1.0).all()
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path)
+    a, b, c = put(cache, 1.0, 100), put(cache, 2.0, 200), put(cache, 3.0, 300)
+    entry = sum(p.stat().st_size for p in tmp_path.iterdir()) // 3
+
+    assert cache.get(a) is not None  # a becomes the most recent
+    cache.max_bytes = 2 * entry + 1
+    cache.evict()
+
+    assert cache.get(b) is None
+    assert cache.get(a) is not None
+    assert cache.get(c) is not None
+    assert len(list(tmp_path.iterdir())) == 4
+
+
+def test_cache_drops_corrupt_entry(tmp_path):
+    cache = ResultCache(tmp_path)
+    params = put(cache, 1.0)
+    (tmp_path / f"{cache.key(params)}.json").write_text("{}")
+
+    assert cache.get(params) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cache_removes_stale_orphans(tmp_path):
+    cache = ResultCache(tmp_path)
+    params = put(cache, 1.0)
+    old = time.time() - 2 * ResultCache.ORPHAN_AGE
+    orphan = tmp_path / f"{'a' * 64}.json"
+    young = tmp_path / f"{'b' * 64}.npy"
+    tmp = tmp_path / f"{'c' * 64}.1.2.tmp"
+    foreign = tmp_path / "notes.txt"
+    for path in (orphan, young, tmp, foreign):
+        path.write_text("x")
+    for path in (orphan, tmp, foreign):
+        os.utime(path, (old, old))
+
+    cache.evict()
+
+    assert not orphan.exists()
+    assert not tmp.exists()
+    assert young.exists()
+    assert foreign.exists()
+    assert cache.get(params) is not None
+
+
+def test_sweep_marks_cache_hits(tmp_path, solver_server):
+    endpoint, calls = solver_server(healthy)
+    cache = ResultCache(tmp_path)
+
+    first = run_sweep(JOBS[:2], [endpoint], cache=cache)
+    second = run_sweep(JOBS[:2], [endpoint], cache=cache)
+
+    assert not any(r.cached for r in first)
+    assert all(r.cached for r in second)
+    assert len(calls) == 2
+    for r in second:
+        assert (r.heatmap == r.job.alpha).all()
+
+
+def streaming(frames: int | None = None):
+    """Stream handler that sends frame k filled with k, hanging up after `frames`."""
+    def handler(conn: socket.socket) -> None:
+        *_, rows, columns, t, sample_rate, _, _ = read_params(conn)
+        n = frame_count(t, sample_rate)
+        for i in range(n if frames is None else frames):
+            conn.sendall(Step.pack(i * sample_rate + 1) + np.full(rows * columns, i, np.float32).tobytes())
+        if frames is None:
+            conn.sendall(Step.pack(-1) + WallTime.pack(10**6) + bytes(rows * columns * 4))
+    return handler
+
+
+def drain(gen):
+    while True:
+        try:
+            next(gen)
+        except StopIteration as e:
+            return e.value
+
+
+def test_truncate_series(tmp_path):
+    path = tmp_path / "series.npy"
+    data = np.arange(5 * 30 * 4, dtype=np.float32).reshape(5, 30, 4)
+    np.save(path, data)
+
+    truncate_series(path, 2)
+    assert np.array_equal(np.load(path), data[:2])
+
+    truncate_series(path, 0)
+    assert np.load(path).shape == (0, 30, 4)
+
+
+def test_stream_tool_full_run(tmp_path, solver_server):
+    (host, port), _ = solver_server(streaming())
+    path = tmp_path / "series.npy"
+
+    dt, T = drain(stream_tool(1.0, 1.0, 1, port, path, 30, 20, 100, host))
+
+    assert dt == timedelta(milliseconds=1)
+    assert T.shape == (30, 20)
+    series = np.load(path)
+    assert series.shape == (frame_count(1.0, 100), 30, 20)
+    assert (series == np.arange(len(series))[:, None, None]).all()
+
+
+def test_stream_tool_truncates_cut_short_run(tmp_path, solver_server):
+    (host, port), _ = solver_server(streaming(2))
+    path = tmp_path / "series.npy"
+
+    with pytest.raises(ConnectionError):
+        drain(stream_tool(1.0, 1.0, 1, port, path, 30, 20, 100, host))
+
+    series = np.load(path)
+    assert series.shape == (2, 30, 20)
+    assert (series == np.arange(2)[:, None, None]).all()
+
+
+def test_stream_tool_truncates_on_close(tmp_path, solver_server):
+    (host, port), _ = solver_server(streaming())
+    path = tmp_path / "series.npy"
+
+    gen = stream_tool(1.0, 1.0, 1, port, path, 30, 20, 100, host)
+    next(gen)
+    next(gen)
+    gen.close()
+
+    assert np.load(path).shape == (2, 30, 20)
+
+
+def naive_step(u: np.ndarray, alpha: float) -> np.ndarray:
+    """Grid::step with the geometry of server/main.cpp, one cell at a time."""
+    rows, columns = u.shape
+    u[:30, 0] = 1.0
+
+    def is_wall(x, y):
+        return x == -1 or x == columns or y == -1 or y == rows or (30 <= y <= 60 and x <= 30)
+
+    def at(x, y):
+        if is_wall(x, y):
+            if x == -1: x += 1
+            elif x == columns: x -= 1
+            elif y == -1: y += 1
+            elif y == rows: y -= 1
+            elif x == 30: x += 1
+            elif y == 30: y -= 1
+            elif y == 60: y += 1
+        return u[y, x]
+
+    dx, dy, dt, a = np.float32(DX), np.float32(DY), np.float32(DT), np.float32(alpha)
+    u_new = u.copy()
+    for y in range(rows):
+        for x in range(columns):
+            if is_wall(x, y):
+                continue
+            dudx2 = (at(x + 1, y) - 2 * at(x, y) + at(x - 1, y)) / (dx * dx)
+            dudy2 = (at(x, y + 1) - 2 * at(x, y) + at(x, y - 1)) / (dy * dy)
+            u_new[y, x] = at(x, y) + dt * a * (dudx2 + dudy2)
+    return u_new
+
+
+def test_reference_solver_matches_grid_step():
+    solver = ReferenceSolver(2.0, 70, 40)
+    u = np.zeros((70, 40), np.float32)
+    for _ in range(5):
+        solver.step()
+        u = naive_step(u, 2.0)
+    assert np.array_equal(solver.u, u)
+
+
+def test_reference_solver_keeps_walls_cold():
+    _, T = ReferenceSolver(1.0, 100, 100).run(1.0)
+
+    assert (T[30:61, :31] == 0).all()
+    assert (T >= 0).all() and (T <= 1).all()
+    assert T[29, 10] > 0 and T[61, 10] > 0
+
+
+@pytest.mark.parametrize("rows, columns", [(29, 100), (100, 1)])
+def test_reference_solver_rejects_small_grid(rows, columns):
+    with pytest.raises(ValueError):
+        ReferenceSolver(1.0, rows, columns)
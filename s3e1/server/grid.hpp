@@ -27,6 +27,11 @@ concept BoundaryFunc = requires (T t, std::vector<Value>& v) {
   t(v);
 };
 
+template <typename T>
+concept SampleFunc = requires (T t, std::size_t i, const std::vector<Value>& v) {
+  { t(i, v) } -> std::convertible_to<bool>;
+};
+
 template <typename T>
 concept VectorFieldFunc = requires (T t, Coord x) {
   { t(x, x) } -> std::convertible_to<std::pair<Coord, Coord>>;
@@ -39,6 +44,12 @@ inline void save(const std::string& path, const std::vector<std::vector<Value>>&
       ofs << i;
 }
 
+enum class Mode : std::size_t {
+  Run,     // wall time and final heatmap
+  Stream,  // sampled frames first, then as Run
+  Info,    // solver host and build info, nothing is computed
+};
+
 struct Params {
   Value alpha;
   Value dt, dx, dy;
@@ -46,6 +57,7 @@ struct Params {
   Value t;
   std::size_t sample_rate;
   std::size_t num_threads;
+  Mode mode;
 };
 
 struct Result {
@@ -94,21 +106,33 @@ public:
     std::swap(u, u_new);
   }
 
-  Result run(const std::string& path) && {
+  template <SampleFunc SampleFn>
+  Result run(SampleFn&& on_sample) && {
     const std::size_t n = std::floor(params.t / params.dt);
 
     const auto start = std::chrono::steady_clock::now();
     for (auto i = 0ull; i < n; ++i) {
       step();
+      // on_sample returns false to abort the run, e.g. once nobody listens.
       if (params.sample_rate != std::numeric_limits<std::size_t>::max() && i % params.sample_rate == 0)
-        history.push_back(u);
+        if (!on_sample(i, u))
+          break;
     }
     const auto dur = std::chrono::steady_clock::now() - start;
 
-    save(path, history);
     return { .heatmap = std::move(u), .wall_time = dur };
   }
 
+  Result run(const std::string& path) && {
+    std::vector<std::vector<Value>> history;
+    auto result = std::move(*this).run([&](std::size_t, const std::vector<Value>& v) {
+      history.push_back(v);
+      return true;
+    });
+    save(path, history);
+    return result;
+  }
+
 protected:
   const Value& at(std::int64_t x, std::int64_t y) const {
     if (is_wall(x, y)) [[unlikely]] {
@@ -124,5 +148,4 @@ protected:
   WallNormalFn wall_normal;
   Params params;
   std::vector<Value> u, u_new;
-  std::vector<std::vector<Value>> history;
 };
@@ -3,12 +3,75 @@
 #include <cstddef>
 #include <cstdio>
 #include <cstring>
+#include <fstream>
+#include <string>
+#include <thread>
 
 #include <sys/socket.h>
 #include <sys/types.h>
+#include <sys/utsname.h>
 #include <netinet/in.h>
 #include <unistd.h>
 
+// Set by the Makefile, so benchmark results can be tied to a build.
+#ifndef BUILD_REV
+#define BUILD_REV "unknown"
+#endif
+#ifndef BUILD_FLAGS
+#define BUILD_FLAGS "unknown"
+#endif
+
+static bool send_all(int fd, const void* buf, std::size_t size) {
+  const char* data = static_cast<const char*>(buf);
+  while (size > 0) {
+    const auto n = send(fd, data, std::min(size, 4096ul), MSG_NOSIGNAL);
+    if (n < 0) {
+      perror("send");
+      return false;
+    }
+    data += n, size -= n;
+  }
+  return true;
+}
+
+static std::string json_string(const std::string& s) {
+  std::string out = "\"";
+  for (const char c : s) {
+    if (c == '"' || c == '\\')
+      out += '\\';
+    if (static_cast<unsigned char>(c) >= 0x20)
+      out += c;
+  }
+  return out + "\"";
+}
+
+static std::string cpu_model() {
+  std::ifstream ifs("/proc/cpuinfo");
+  for (std::string line; std::getline(ifs, line);)
+    if (line.starts_with("model name"))
+      return line.substr(line.find(':') + 2);
+  return "unknown";
+}
+
+static std::string server_info() {
+  char hostname[256] = {};
+  gethostname(hostname, sizeof(hostname) - 1);
+  utsname u;
+  uname(&u);
+
+  return std::string("{")
+    + "\"node\": " + json_string(hostname)
+    + ", \"platform\": " + json_string(std::string(u.sysname) + " " + u.release)
+    + ", \"machine\": " + json_string(u.machine)
+    + ", \"cpu\": " + json_string(cpu_model())
+    + ", \"cpu_count\": " + std::to_string(std::thread::hardware_concurrency())
+    + ", \"omp_max_threads\": " + std::to_string(omp_get_max_threads())
+    + ", \"compiler\": " + json_string(__VERSION__)
+    + ", \"revision\": " + json_string(BUILD_REV)
+    + ", \"flags\": " + json_string(BUILD_FLAGS)
+    + "}";
+}
+
 int main() {
   Params p;
 
@@ -46,7 +109,18 @@ int main() {
       return -1;
     }
 
-    printf("alpha = %f, t = %f, num_cpus = %zu\n", p.alpha, p.t, p.num_threads);
+    if (p.mode == Mode::Info) {
+      // Length prefixed JSON
+      const auto info = server_info();
+      const std::uint64_t size = info.size();
+      if (send_all(fd, &size, sizeof(size)))
+        send_all(fd, info.data(), size);
+      close(fd);
+      continue;
+    }
+
+    printf("alpha = %f, t = %f, num_cpus = %zu, mode = %zu\n",
+           p.alpha, p.t, p.num_threads, static_cast<std::size_t>(p.mode));
 
     Grid g(
       p,
@@ -75,14 +149,30 @@ int main() {
       }
     );
 
-    const auto result = std::move(g).run("out.dat");
-
-    send(fd, &result.wall_time, sizeof(result.wall_time), 0);
+    // Streaming: every sampled frame goes out as it is produced, tagged
+    // with the number of steps taken, then -1 marks the end. Final result
+    // follows as usual.
+    Result result;
+    bool ok = true;
+    if (p.mode == Mode::Stream) {
+      result = std::move(g).run([&](std::size_t i, const std::vector<Value>& v) {
+        // run() samples after step i, so i + 1 steps are done
+        const std::int64_t step = i + 1;
+        ok = ok
+          && send_all(fd, &step, sizeof(step))
+          && send_all(fd, v.data(), v.size() * sizeof(Value));
+        // Client is gone, free the server for the next one.
+        return ok;
+      });
+      const std::int64_t end = -1;
+      ok = ok && send_all(fd, &end, sizeof(end));
+    } else {
+      result = std::move(g).run("out.dat");
+    }
 
-    const char* data = reinterpret_cast<const char*>(result.heatmap.data());
-    const std::size_t size = result.heatmap.size() * sizeof(Value);
-    for(std::size_t i = 0; i < size; i += 4096)
-      send(fd, data + i, std::min(size - i, 4096ul), 0);
+    ok = ok
+      && send_all(fd, &result.wall_time, sizeof(result.wall_time))
+      && send_all(fd, result.heatmap.data(), result.heatmap.size() * sizeof(Value));
 
     close(fd);
   }